@@ -0,0 +1,128 @@
+"""
+Бенчмарк таблицы cooldown: вложенный словарь против CooldownTable
+
+Показывает расход памяти на запись и стоимость проверки cooldown.
+
+Запуск:
+    python benchmark_cooldown.py
+    python benchmark_cooldown.py --sizes 1000000 --users-per-chat 5,50
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from middlewares.cooldown_table import CooldownTable
+
+
+def iter_keys(size: int, users_per_chat: int, seed: int = 42):
+    """
+    Сгенерировать пары (chat_id, user_id) похожие на реальные ID Telegram.
+
+    Каждый ID - новый объект int, как у входящих апдейтов,
+    поэтому в памяти словаря учитываются и сами ключи.
+    """
+    rnd = random.Random(seed)
+    chats = max(size // users_per_chat, 1)
+    chat_ids = [-1001000000000 - rnd.randrange(10 ** 9) for _ in range(chats)]
+    for i in range(size):
+        yield chat_ids[i % chats], rnd.randrange(1, 8 * 10 ** 9)
+
+
+def build_dict(keys, cooldown: int):
+    """Заполнить словарь {chat_id: {user_id: timestamp}} как раньше"""
+    table = {}
+    for chat_id, user_id in keys:
+        table.setdefault(chat_id, {})[user_id] = time.time()
+    return table
+
+
+def build_table(keys, cooldown: int):
+    """
+    Заполнить CooldownTable
+
+    Часы таблицы остановлены, чтобы записи не истекали во время
+    заполнения и не вытеснялись при росте таблицы.
+    """
+    table = CooldownTable(cooldown, clock=lambda: 0.0)
+    for chat_id, user_id in keys:
+        table.check_and_set(chat_id, user_id)
+    return table
+
+
+def dict_check(table, chat_id: int, user_id: int, cooldown: int) -> bool:
+    """Проверка cooldown в старом формате"""
+    last = table.get(chat_id, {}).get(user_id)
+    return last is not None and time.time() - last < cooldown
+
+
+def measure(builder, keys, cooldown: int):
+    """Построить таблицу и вернуть (таблица, байт выделено)"""
+    gc.collect()
+    tracemalloc.start()
+    table = builder(keys, cooldown)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table, size
+
+
+def run(size: int, users_per_chat: int, lookups: int, cooldown: int) -> None:
+    """Прогнать бенчмарк для одного размера"""
+    step = max(size // lookups, 1)
+    probes = [
+        key for i, key in enumerate(iter_keys(size, users_per_chat))
+        if i % step == 0
+    ]
+    random.Random(7).shuffle(probes)
+
+    old, old_bytes = measure(
+        build_dict, iter_keys(size, users_per_chat), cooldown
+    )
+    old_entries = sum(len(users) for users in old.values())
+    start = time.perf_counter()
+    for chat_id, user_id in probes:
+        dict_check(old, chat_id, user_id, cooldown)
+    old_ns = (time.perf_counter() - start) / len(probes) * 1e9
+    del old
+
+    new, new_bytes = measure(
+        build_table, iter_keys(size, users_per_chat), cooldown
+    )
+    new_entries = len(new)
+    # remaining() только читает таблицу, как и dict_check
+    start = time.perf_counter()
+    for chat_id, user_id in probes:
+        new.remaining(chat_id, user_id)
+    new_ns = (time.perf_counter() - start) / len(probes) * 1e9
+    del new
+
+    print(f"\n📊 {size:,} записей ({users_per_chat} пользователей на чат)")
+    print(f"  dict:          {old_bytes / old_entries:8.1f} байт/запись, "
+          f"{old_ns:8.1f} нс/проверка")
+    print(f"  CooldownTable: {new_bytes / new_entries:8.1f} байт/запись, "
+          f"{new_ns:8.1f} нс/проверка")
+
+
+def main():
+    """Главная функция бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="1000000,10000000",
+        help="Количество записей через запятую"
+    )
+    parser.add_argument(
+        "--users-per-chat", default="5,50,1000",
+        help="Размеры чатов через запятую (от обычных групп до крупных)"
+    )
+    parser.add_argument("--lookups", type=int, default=200000)
+    parser.add_argument("--cooldown", type=int, default=10)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        for users_per_chat in (int(u) for u in args.users_per_chat.split(",")):
+            run(size, users_per_chat, args.lookups, args.cooldown)
+
+
+if __name__ == "__main__":
+    main()
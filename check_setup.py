@@ -59,7 +59,7 @@ def check_env_file():
 
 def check_structure():
     """Проверка структуры проекта"""
-    required_dirs = ['config', 'handlers', 'middlewares']
+    required_dirs = ['config', 'handlers', 'middlewares', 'utils']
     required_files = ['main.py', 'requirements.txt']
     
     all_ok = True
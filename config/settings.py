@@ -24,6 +24,15 @@ class Settings:
     # Настройки cooldown
     MESSAGE_COOLDOWN: int = 10  # секунд
     
+    # Отображение cooldown: "user" - отсчет для каждого, "board" - табло чата
+    COOLDOWN_DISPLAY: str = "user"
+    COOLDOWN_BOARD_PIN: bool = False  # закреплять табло
+    
+    # Event loop: uvloop (если установлен) и watchdog задержек
+    FAST_EVENT_LOOP: bool = False
+    LOOP_WATCHDOG: bool = False
+    LOOP_LAG_THRESHOLD_MS: int = 100  # порог вывода стека блокировки
+    
     # Режим отладки
     DEBUG: bool = False
     
@@ -38,9 +47,21 @@ class Settings:
                 "Установите переменную окружения BOT_TOKEN"
             )
         
+        cooldown_display = os.getenv('COOLDOWN_DISPLAY', 'user').lower()
+        if cooldown_display not in ('user', 'board'):
+            raise ValueError(
+                f"Неизвестный COOLDOWN_DISPLAY: {cooldown_display}. "
+                "Допустимые значения: user, board"
+            )
+        
         return cls(
             BOT_TOKEN=bot_token,
             MESSAGE_COOLDOWN=int(os.getenv('MESSAGE_COOLDOWN', '10')),
+            COOLDOWN_DISPLAY=cooldown_display,
+            COOLDOWN_BOARD_PIN=os.getenv('COOLDOWN_BOARD_PIN', 'False').lower() == 'true',
+            FAST_EVENT_LOOP=os.getenv('FAST_EVENT_LOOP', 'False').lower() == 'true',
+            LOOP_WATCHDOG=os.getenv('LOOP_WATCHDOG', 'False').lower() == 'true',
+            LOOP_LAG_THRESHOLD_MS=int(os.getenv('LOOP_LAG_THRESHOLD_MS', '100')),
             DEBUG=os.getenv('DEBUG', 'False').lower() == 'true'
         )
 
@@ -0,0 +1,3 @@
+"""
+Настройка pytest: корень проекта в sys.path для импорта пакетов бота
+"""
@@ -8,9 +8,10 @@ from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
-from config.settings import get_settings
+from config.settings import get_settings, Settings
 from middlewares import CooldownMiddleware
 from handlers import command_router, group_router
+from utils import install_fast_event_loop, LoopWatchdog
 
 # Настройка логирования
 logging.basicConfig(
@@ -24,22 +25,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    """Главная функция запуска бота"""
+async def main(settings: Settings):
+    """
+    Главная функция запуска бота
     
-    # Загружаем настройки
-    try:
-        settings = get_settings()
-        logger.info("Настройки успешно загружены")
-    except ValueError as e:
-        logger.error(f"Ошибка загрузки настроек: {e}")
-        sys.exit(1)
+    Args:
+        settings: Загруженные настройки приложения
+    """
     
     # Устанавливаем уровень логирования
     if settings.DEBUG:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Режим отладки включен")
     
+    # Запускаем watchdog задержек event loop
+    watchdog = None
+    if settings.LOOP_WATCHDOG:
+        watchdog = LoopWatchdog(threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000)
+        watchdog.start()
+    
     # Инициализируем бот и диспетчер
     bot = Bot(
         token=settings.BOT_TOKEN,
@@ -50,10 +54,15 @@ async def main():
     
     # Подключаем middleware для cooldown
     cooldown_middleware = CooldownMiddleware(
-        cooldown_seconds=settings.MESSAGE_COOLDOWN
+        cooldown_seconds=settings.MESSAGE_COOLDOWN,
+        display_mode=settings.COOLDOWN_DISPLAY,
+        pin_board=settings.COOLDOWN_BOARD_PIN
     )
     dp.message.middleware(cooldown_middleware)
-    logger.info(f"Cooldown middleware подключен ({settings.MESSAGE_COOLDOWN}s)")
+    logger.info(
+        f"Cooldown middleware подключен ({settings.MESSAGE_COOLDOWN}s, "
+        f"режим: {settings.COOLDOWN_DISPLAY})"
+    )
     
     # Регистрируем роутеры
     dp.include_router(command_router)
@@ -77,13 +86,25 @@ async def main():
         logger.error(f"Ошибка при запуске бота: {e}")
         raise
     finally:
+        if watchdog is not None:
+            await watchdog.stop()
         await bot.session.close()
         logger.info("Бот остановлен")
 
 
 if __name__ == "__main__":
+    # Загружаем настройки до создания event loop: от них зависит его выбор
+    try:
+        settings = get_settings()
+        logger.info("Настройки успешно загружены")
+    except ValueError as e:
+        logger.error(f"Ошибка загрузки настроек: {e}")
+        sys.exit(1)
+    
     try:
-        asyncio.run(main())
+        if settings.FAST_EVENT_LOOP:
+            install_fast_event_loop()
+        asyncio.run(main(settings))
     except KeyboardInterrupt:
         logger.info("Бот остановлен пользователем")
     except Exception as e:
@@ -12,9 +12,10 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
-from config.settings import get_settings
-from middlewares import CooldownMiddleware
+from config.settings import get_settings, Settings
+from middlewares import CooldownMiddleware, UpdateDedupMiddleware
 from handlers import command_router, group_router
+from utils import LoopWatchdog, install_fast_event_loop
 
 # Настройка логирования
 logging.basicConfig(
@@ -40,6 +41,10 @@ async def on_startup(app: web.Application):
     """Действия при запуске приложения"""
     bot: Bot = app["bot"]
     
+    # Запускаем watchdog задержек event loop
+    if app["watchdog"] is not None:
+        app["watchdog"].start()
+    
     # Устанавливаем webhook
     await bot.set_webhook(
         url=WEBHOOK_URL,
@@ -62,19 +67,21 @@ async def on_shutdown(app: web.Application):
     await bot.delete_webhook(drop_pending_updates=True)
     await bot.session.close()
     
+    if app["watchdog"] is not None:
+        await app["watchdog"].stop()
+    
+    dedup: UpdateDedupMiddleware = app["dedup"]
+    logger.info(f"Повторных доставок отброшено: {dedup.duplicates}")
     logger.info("Бот остановлен")
 
 
-def create_app() -> web.Application:
-    """Создание и настройка приложения"""
+def create_app(settings: Settings) -> web.Application:
+    """
+    Создание и настройка приложения
     
-    # Загружаем настройки
-    try:
-        settings = get_settings()
-        logger.info("Настройки успешно загружены")
-    except ValueError as e:
-        logger.error(f"Ошибка загрузки настроек: {e}")
-        sys.exit(1)
+    Args:
+        settings: Загруженные настройки приложения
+    """
     
     # Устанавливаем уровень логирования
     if settings.DEBUG:
@@ -89,12 +96,21 @@ def create_app() -> web.Application:
     
     dp = Dispatcher()
     
+    # Отбрасываем повторные доставки апдейтов до любой обработки
+    dedup_middleware = UpdateDedupMiddleware()
+    dp.update.outer_middleware(dedup_middleware)
+    
     # Подключаем middleware для cooldown
     cooldown_middleware = CooldownMiddleware(
-        cooldown_seconds=settings.MESSAGE_COOLDOWN
+        cooldown_seconds=settings.MESSAGE_COOLDOWN,
+        display_mode=settings.COOLDOWN_DISPLAY,
+        pin_board=settings.COOLDOWN_BOARD_PIN
     )
     dp.message.middleware(cooldown_middleware)
-    logger.info(f"Cooldown middleware подключен ({settings.MESSAGE_COOLDOWN}s)")
+    logger.info(
+        f"Cooldown middleware подключен ({settings.MESSAGE_COOLDOWN}s, "
+        f"режим: {settings.COOLDOWN_DISPLAY})"
+    )
     
     # Регистрируем роутеры
     dp.include_router(command_router)
@@ -106,6 +122,14 @@ def create_app() -> web.Application:
     
     # Добавляем бота в контекст приложения
     app["bot"] = bot
+    app["dedup"] = dedup_middleware
+    
+    # Watchdog задержек event loop (запускается в on_startup)
+    app["watchdog"] = None
+    if settings.LOOP_WATCHDOG:
+        app["watchdog"] = LoopWatchdog(
+            threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000
+        )
     
     # Регистрируем обработчики запуска и остановки
     app.on_startup.append(on_startup)
@@ -131,9 +155,22 @@ async def health_check(request):
 
 def main():
     """Главная функция запуска бота"""
+    
+    # Загружаем настройки
+    try:
+        settings = get_settings()
+        logger.info("Настройки успешно загружены")
+    except ValueError as e:
+        logger.error(f"Ошибка загрузки настроек: {e}")
+        sys.exit(1)
+    
     try:
         # Создаем приложение
-        app = create_app()
+        app = create_app(settings)
+        
+        # Event loop выбирается до его создания в web.run_app
+        if settings.FAST_EVENT_LOOP:
+            install_fast_event_loop()
         
         # Добавляем health check endpoint
         app.router.add_get("/health", health_check)
@@ -2,5 +2,7 @@
 Пакет middlewares
 """
 from .cooldown import CooldownMiddleware
+from .cooldown_table import CooldownTable
+from .dedup import UpdateDedupMiddleware
 
-__all__ = ['CooldownMiddleware']
+__all__ = ['CooldownMiddleware', 'CooldownTable', 'UpdateDedupMiddleware']
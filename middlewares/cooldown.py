@@ -1,13 +1,16 @@
 """
 Middleware для контроля таймаута между сообщениями пользователей
 """
-import time
+import asyncio
 import logging
 from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message
 
+from .cooldown_board import CooldownBoard
+from .cooldown_table import CooldownTable
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,21 +18,35 @@ class CooldownMiddleware(BaseMiddleware):
     """
     Middleware для ограничения частоты сообщений от пользователей в группах.
     
-    Хранит время последнего сообщения каждого пользователя в каждом чате.
+    Хранит время окончания cooldown каждого пользователя в каждом чате
+    (см. CooldownTable).
     Если пользователь пытается отправить сообщение раньше cooldown периода,
-    сообщение удаляется и отправляется предупреждение.
+    сообщение удаляется и отправляется предупреждение: личный обратный
+    отсчет (режим "user") или строка на общем табло чата (режим "board").
     """
     
-    def __init__(self, cooldown_seconds: int = 10):
+    def __init__(
+        self,
+        cooldown_seconds: int = 10,
+        display_mode: str = "user",
+        pin_board: bool = False
+    ):
         """
         Args:
             cooldown_seconds: Минимальное время между сообщениями в секундах
+            display_mode: "user" - сообщение на каждого пользователя,
+                "board" - одно табло на чат
+            pin_board: Закреплять табло в чате (только для режима "board")
         """
         super().__init__()
         self.cooldown_seconds = cooldown_seconds
-        # Словарь для хранения времени последнего сообщения
-        # Структура: {chat_id: {user_id: timestamp}}
-        self.user_last_message: Dict[int, Dict[int, float]] = {}
+        if display_mode not in ("user", "board"):
+            raise ValueError(f"Неизвестный режим отображения: {display_mode}")
+        # Общее табло чата (None в режиме "user")
+        self.board = CooldownBoard(pin=pin_board) if display_mode == "board" else None
+        # Компактная таблица времени окончания cooldown
+        # для каждой пары (chat_id, user_id)
+        self.cooldowns = CooldownTable(cooldown_seconds)
     
     async def __call__(
         self,
@@ -58,74 +75,80 @@ class CooldownMiddleware(BaseMiddleware):
         
         chat_id = event.chat.id
         user_id = event.from_user.id
-        current_time = time.time()
-        
-        # Инициализируем словарь для чата если его нет
-        if chat_id not in self.user_last_message:
-            self.user_last_message[chat_id] = {}
         
-        # Проверяем время последнего сообщения пользователя
-        if user_id in self.user_last_message[chat_id]:
-            last_message_time = self.user_last_message[chat_id][user_id]
-            time_passed = current_time - last_message_time
-            
-            # Если прошло меньше времени чем cooldown
-            if time_passed < self.cooldown_seconds:
-                try:
-                    # Удаляем сообщение пользователя
-                    await event.delete()
-                    
-                    # Отправляем предупреждение с обратным отсчетом
-                    wait_time = int(self.cooldown_seconds - time_passed)
-                    
-                    # Имя пользователя для персонализации
-                    user_name = event.from_user.first_name or "Пользователь"
-                    
-                    warning_msg = await event.answer(
-                        f"⏱ {user_name}, подожди еще <b>{wait_time}</b> сек.",
-                        reply_to_message_id=None
-                    )
-                    
-                    # Обновляем сообщение каждую секунду
-                    import asyncio
-                    for remaining in range(wait_time - 1, 0, -1):
-                        await asyncio.sleep(1)
-                        try:
-                            await warning_msg.edit_text(
-                                f"⏱ {user_name}, подожди еще <b>{remaining}</b> сек."
-                            )
-                        except Exception:
-                            break  # Если сообщение удалено, прекращаем обновление
-                    
-                    # Финальное сообщение
-                    await asyncio.sleep(1)
-                    try:
-                        await warning_msg.edit_text(
-                            f"✅ {user_name}, теперь можешь отправлять сообщения!"
-                        )
-                        # Удаляем через 3 секунды
-                        await asyncio.sleep(3)
-                        await warning_msg.delete()
-                    except Exception:
-                        pass
-                    
-                    logger.info(
-                        f"Сообщение от {user_id} в чате {chat_id} "
-                        f"заблокировано (cooldown: {wait_time}s)"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Ошибка при обработке cooldown: {e}")
+        # Проверяем cooldown пользователя (и начинаем новый, если он истек)
+        time_left = self.cooldowns.check_and_set(chat_id, user_id)
+        if time_left > 0:
+            try:
+                # Удаляем сообщение пользователя
+                await event.delete()
                 
-                # Блокируем дальнейшую обработку
-                return None
-        
-        # Обновляем время последнего сообщения
-        self.user_last_message[chat_id][user_id] = current_time
+                # Отправляем предупреждение с обратным отсчетом
+                wait_time = int(time_left)
+                
+                # Имя пользователя для персонализации
+                user_name = event.from_user.first_name or "Пользователь"
+                
+                if self.board is not None:
+                    self.board.add(event, user_name, time_left)
+                else:
+                    await self._show_countdown(event, user_name, wait_time)
+                
+                logger.info(
+                    f"Сообщение от {user_id} в чате {chat_id} "
+                    f"заблокировано (cooldown: {wait_time}s)"
+                )
+                
+            except Exception as e:
+                logger.error(f"Ошибка при обработке cooldown: {e}")
+            
+            # Блокируем дальнейшую обработку
+            return None
         
         # Продолжаем обработку
         return await handler(event, data)
     
+    async def _show_countdown(
+        self,
+        event: Message,
+        user_name: str,
+        wait_time: int
+    ) -> None:
+        """
+        Личное предупреждение с обратным отсчетом, обновляемое каждую секунду
+        
+        Args:
+            event: Заблокированное сообщение
+            user_name: Имя пользователя
+            wait_time: Оставшееся время cooldown в секундах
+        """
+        warning_msg = await event.answer(
+            f"⏱ {user_name}, подожди еще <b>{wait_time}</b> сек.",
+            reply_to_message_id=None
+        )
+        
+        # Обновляем сообщение каждую секунду
+        for remaining in range(wait_time - 1, 0, -1):
+            await asyncio.sleep(1)
+            try:
+                await warning_msg.edit_text(
+                    f"⏱ {user_name}, подожди еще <b>{remaining}</b> сек."
+                )
+            except Exception:
+                break  # Если сообщение удалено, прекращаем обновление
+        
+        # Финальное сообщение
+        await asyncio.sleep(1)
+        try:
+            await warning_msg.edit_text(
+                f"✅ {user_name}, теперь можешь отправлять сообщения!"
+            )
+            # Удаляем через 3 секунды
+            await asyncio.sleep(3)
+            await warning_msg.delete()
+        except Exception:
+            pass
+    
     def clear_user_cooldown(self, chat_id: int, user_id: int) -> None:
         """
         Очистка cooldown для конкретного пользователя
@@ -134,8 +157,9 @@ class CooldownMiddleware(BaseMiddleware):
             chat_id: ID чата
             user_id: ID пользователя
         """
-        if chat_id in self.user_last_message:
-            self.user_last_message[chat_id].pop(user_id, None)
+        self.cooldowns.clear_user(chat_id, user_id)
+        if self.board is not None:
+            self.board.discard(chat_id, user_id)
     
     def clear_chat_cooldowns(self, chat_id: int) -> None:
         """
@@ -144,7 +168,9 @@ class CooldownMiddleware(BaseMiddleware):
         Args:
             chat_id: ID чата
         """
-        self.user_last_message.pop(chat_id, None)
+        self.cooldowns.clear_chat(chat_id)
+        if self.board is not None:
+            self.board.clear(chat_id)
 
 
 # Расширение для Message для удаления с задержкой
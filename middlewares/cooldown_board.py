@@ -0,0 +1,243 @@
+"""
+Общее табло cooldown для чата
+
+Вместо отдельного сообщения с обратным отсчетом для каждого пользователя
+в чате держится одно сообщение со списком всех, кто ждет. Табло
+обновляется с адаптивным интервалом и удаляется, когда список пуст,
+поэтому количество правок зависит от числа чатов, а не пользователей.
+"""
+import asyncio
+import html
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+# Минимальный интервал между обращениями к табло: не больше 12 в минуту
+# при лимите Telegram ~20 сообщений в минуту на группу, остальное -
+# запас на закрепление и другие сообщения бота в том же чате
+MIN_UPDATE_INTERVAL = 5.0
+
+# Интервалы обновления в зависимости от ближайшего окончания cooldown:
+# (если осталось больше N секунд, обновляем раз в M секунд)
+UPDATE_INTERVALS = (
+    (60, 30.0),
+    (30, 10.0),
+)
+
+
+def update_interval(remaining: float) -> float:
+    """
+    Интервал обновления табло: редко для долгого ожидания, чаще под конец
+
+    Args:
+        remaining: Секунд до ближайшего окончания cooldown
+
+    Returns:
+        Интервал в секундах (не меньше MIN_UPDATE_INTERVAL)
+    """
+    for threshold, interval in UPDATE_INTERVALS:
+        if remaining > threshold:
+            return interval
+    return MIN_UPDATE_INTERVAL
+
+
+def format_remaining(remaining: float) -> str:
+    """Оставшееся время с точностью, соответствующей частоте обновления"""
+    if remaining > 60:
+        return f"~{int(remaining // 60) + 1} мин."
+    return f"<b>{int(remaining) + 1}</b> сек."
+
+
+@dataclass
+class _Board:
+    """Состояние табло одного чата"""
+
+    chat_message: Message
+    # {user_id: (имя, время окончания по time.monotonic)}
+    waiting: Dict[int, tuple] = field(default_factory=dict)
+    message: Optional[Message] = None
+    text: str = ""
+    task: Optional[asyncio.Task] = None
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class CooldownBoard:
+    """
+    Табло cooldown: одно сообщение на чат со всеми ожидающими.
+
+    Для каждого чата с непустым списком работает фоновая задача,
+    которая перерисовывает табло и удаляет его, когда все дождались.
+    """
+
+    def __init__(self, pin: bool = False):
+        """
+        Args:
+            pin: Закреплять табло в чате (нужны права администратора)
+        """
+        self.pin = pin
+        self.boards: Dict[int, _Board] = {}
+
+    def add(self, event: Message, user_name: str, time_left: float) -> None:
+        """
+        Добавить пользователя на табло или обновить его время
+
+        Args:
+            event: Заблокированное сообщение (для отправки табло в чат)
+            user_name: Имя пользователя
+            time_left: Оставшееся время cooldown в секундах
+        """
+        chat_id = event.chat.id
+        board = self.boards.get(chat_id)
+        if board is None:
+            board = self.boards[chat_id] = _Board(chat_message=event)
+
+        board.waiting[event.from_user.id] = (
+            user_name, time.monotonic() + time_left
+        )
+        if board.task is None or board.task.done():
+            board.task = asyncio.create_task(self._run(chat_id, board))
+        else:
+            board.wakeup.set()
+
+    def discard(self, chat_id: int, user_id: int) -> None:
+        """
+        Убрать пользователя с табло
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+        """
+        board = self.boards.get(chat_id)
+        if board is not None and board.waiting.pop(user_id, None):
+            board.wakeup.set()
+
+    def clear(self, chat_id: int) -> None:
+        """
+        Убрать с табло всех пользователей чата
+
+        Args:
+            chat_id: ID чата
+        """
+        board = self.boards.get(chat_id)
+        if board is not None:
+            board.waiting.clear()
+            board.wakeup.set()
+
+    def _render(self, board: _Board, now: float) -> str:
+        """Текст табло для текущего момента"""
+        lines = ["⏱ <b>Подождите перед следующим сообщением:</b>"]
+        for name, expires in sorted(board.waiting.values(), key=lambda w: w[1]):
+            lines.append(
+                f"• {html.escape(name)} - {format_remaining(expires - now)}"
+            )
+        return "\n".join(lines)
+
+    async def _send(self, board: _Board, text: str) -> None:
+        """Отправить новое сообщение табло (и закрепить, если нужно)"""
+        try:
+            board.message = await board.chat_message.answer(text)
+        except TelegramRetryAfter as e:
+            logger.warning(f"Flood control при отправке табло, ждем {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+            return
+        except Exception as e:
+            logger.error(f"Ошибка при отправке табло cooldown: {e}")
+            return
+        board.text = text
+
+        if self.pin:
+            try:
+                await board.message.pin(disable_notification=True)
+            except Exception as e:
+                logger.warning(f"Не удалось закрепить табло: {e}")
+
+    async def _publish(self, board: _Board, text: str) -> None:
+        """Отправить или отредактировать сообщение табло"""
+        if text == board.text:
+            return
+        if board.message is None:
+            await self._send(board, text)
+            return
+
+        try:
+            await board.message.edit_text(text)
+            board.text = text
+        except TelegramRetryAfter as e:
+            # Табло остается прежним, обновим его после паузы
+            logger.warning(f"Flood control при обновлении табло, ждем {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+        except TelegramBadRequest as e:
+            if "message is not modified" in e.message:
+                board.text = text
+            elif "message to edit not found" in e.message:
+                # Табло удалили вручную - отправим новое при следующем обновлении
+                board.message = None
+                board.text = ""
+            else:
+                logger.error(f"Ошибка при обновлении табло cooldown: {e}")
+                await self._replace(board)
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении табло cooldown: {e}")
+            await self._replace(board)
+
+    async def _replace(self, board: _Board) -> None:
+        """
+        Удалить табло, которое не удается отредактировать.
+
+        Новое табло отправляется только после удаления старого, иначе
+        в чате копились бы брошенные (и, возможно, закрепленные) табло.
+        """
+        try:
+            await board.message.delete()
+        except Exception as e:
+            logger.warning(f"Не удалось удалить старое табло: {e}")
+            return
+        board.message = None
+        board.text = ""
+
+    async def _run(self, chat_id: int, board: _Board) -> None:
+        """Цикл обновления табло чата"""
+        try:
+            while True:
+                now = time.monotonic()
+                for user_id, (_, expires) in list(board.waiting.items()):
+                    if expires <= now:
+                        del board.waiting[user_id]
+                if not board.waiting:
+                    break
+
+                board.wakeup.clear()
+                await self._publish(board, self._render(board, now))
+                if not board.waiting:
+                    continue
+
+                nearest = min(expires for _, expires in board.waiting.values())
+                delay = min(
+                    update_interval(nearest - now),
+                    max(nearest - now, MIN_UPDATE_INTERVAL)
+                )
+                # Новые пользователи ускоряют обновление, но не чаще лимита
+                try:
+                    await asyncio.wait_for(board.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    elapsed = time.monotonic() - now
+                    if elapsed < MIN_UPDATE_INTERVAL:
+                        await asyncio.sleep(MIN_UPDATE_INTERVAL - elapsed)
+        finally:
+            # Убираем табло до первого await, чтобы новые пользователи
+            # попали уже на новое табло
+            if self.boards.get(chat_id) is board:
+                del self.boards[chat_id]
+            if board.message is not None:
+                try:
+                    await board.message.delete()
+                except Exception:
+                    pass
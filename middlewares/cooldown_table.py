@@ -0,0 +1,235 @@
+"""
+Компактная таблица cooldown на основе массивов
+
+Вместо вложенного словаря {chat_id: {user_id: timestamp}} все пары
+(чат, пользователь) хранятся в одной хеш-таблице с открытой адресацией
+(линейное пробирование) поверх буферов `array`: int64 chat_id, int64
+user_id и int32 время окончания cooldown в миллисекундах относительно
+монотонной "эпохи" таблицы. Слот занимает 20 байт, при заполнении
+таблицы от 35% до 70% это ~30-60 байт на запись независимо от размера
+чатов (см. benchmark_cooldown.py).
+"""
+import time
+from array import array
+
+# Пустой слот. ID пользователей Telegram всегда положительные
+EMPTY_KEY = 0
+
+# Максимальная заполненность таблицы перед ростом (в долях от 1)
+MAX_LOAD = 0.7
+
+# Минимальная емкость таблицы (степень двойки)
+MIN_CAPACITY = 8
+
+# Верхняя граница int32 для смещений времени
+INT32_MAX = 2 ** 31 - 1
+
+# Порог смещения, после которого "эпоха" сдвигается (~12 дней в мс)
+REBASE_THRESHOLD = 2 ** 30
+
+# Мультипликативный хеш (золотое сечение) для перемешивания ID
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_CHAT_MULTIPLIER = 0xC2B2AE3D27D4EB4F
+_UINT64_MASK = 2 ** 64 - 1
+
+
+class CooldownTable:
+    """
+    Таблица cooldown для пар (чат, пользователь).
+
+    Истекшие и очищенные записи считаются отсутствующими: их слоты
+    переиспользуются при вставке и отбрасываются при перестроении
+    таблицы (рост, сдвиг эпохи). Время считается по `time.monotonic()`
+    и не зависит от перевода системных часов.
+    """
+
+    def __init__(self, cooldown_seconds: int = 10, clock=time.monotonic):
+        """
+        Args:
+            cooldown_seconds: Длительность cooldown в секундах
+            clock: Источник монотонного времени в секундах
+        """
+        self.cooldown_seconds = cooldown_seconds
+        self._cooldown_ms = min(int(cooldown_seconds * 1000), REBASE_THRESHOLD)
+        self._clock = clock
+        self._epoch = clock()
+        self._allocate(MIN_CAPACITY)
+
+    def _allocate(self, capacity: int) -> None:
+        """Создать пустые буферы заданной емкости"""
+        self._chats = array('q', bytes(8 * capacity))
+        self._users = array('q', bytes(8 * capacity))
+        self._expires = array('i', bytes(4 * capacity))
+        self._mask = capacity - 1
+        self._shift = 64 - capacity.bit_length() + 1
+        # Занятые слоты, включая истекшие
+        self._used = 0
+
+    def _slot(self, chat_id: int, user_id: int) -> int:
+        """Начальный слот для пары (чат, пользователь)"""
+        mixed = ((chat_id * _CHAT_MULTIPLIER) ^ user_id) & _UINT64_MASK
+        return ((mixed * _HASH_MULTIPLIER) & _UINT64_MASK) >> self._shift
+
+    def _find(self, chat_id: int, user_id: int) -> int:
+        """Слот пары (чат, пользователь) или -1 если ее нет"""
+        users = self._users
+        chats = self._chats
+        mask = self._mask
+        i = self._slot(chat_id, user_id)
+        while True:
+            user = users[i]
+            if user == user_id and chats[i] == chat_id:
+                return i
+            if user == EMPTY_KEY:
+                return -1
+            i = (i + 1) & mask
+
+    def _now(self) -> int:
+        """Текущее смещение времени в мс относительно эпохи"""
+        now = int((self._clock() - self._epoch) * 1000)
+        if now >= REBASE_THRESHOLD:
+            # Сдвигаем эпоху, чтобы смещения оставались в пределах int32
+            self._epoch += now / 1000
+            self._rebuild(now, shift=now)
+            now = int((self._clock() - self._epoch) * 1000)
+        return now
+
+    def _rebuild(self, now: int, shift: int = 0) -> None:
+        """
+        Перестроить таблицу без истекших записей
+
+        Новая емкость выбирается так, чтобы заполненность была не больше
+        3/4 MAX_LOAD (рост из полной таблицы - ровно вдвое), поэтому
+        таблица может как расти, так и сжиматься.
+
+        Args:
+            now: Текущее смещение времени
+            shift: На сколько уменьшить все смещения (сдвиг эпохи)
+        """
+        chats = self._chats
+        users = self._users
+        expires = self._expires
+        alive = [
+            i for i in range(len(users))
+            if users[i] != EMPTY_KEY and expires[i] > now
+        ]
+
+        capacity = MIN_CAPACITY
+        while len(alive) + 1 > capacity * MAX_LOAD * 0.75:
+            capacity *= 2
+        self._allocate(capacity)
+
+        new_chats = self._chats
+        new_users = self._users
+        new_expires = self._expires
+        mask = self._mask
+        for i in alive:
+            j = self._slot(chats[i], users[i])
+            while new_users[j] != EMPTY_KEY:
+                j = (j + 1) & mask
+            new_chats[j] = chats[i]
+            new_users[j] = users[i]
+            new_expires[j] = expires[i] - shift
+        self._used = len(alive)
+
+    def check_and_set(self, chat_id: int, user_id: int) -> float:
+        """
+        Проверить cooldown пользователя и начать новый, если он истек
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+
+        Returns:
+            Оставшееся время cooldown в секундах
+            (0 если пользователь может писать и cooldown перезапущен)
+        """
+        now = self._now()
+        expire = min(now + self._cooldown_ms, INT32_MAX)
+        chats = self._chats
+        users = self._users
+        expires = self._expires
+        mask = self._mask
+        i = self._slot(chat_id, user_id)
+        free = -1
+        while True:
+            user = users[i]
+            if user == user_id and chats[i] == chat_id:
+                remaining = expires[i] - now
+                if remaining > 0:
+                    return remaining / 1000
+                expires[i] = expire
+                return 0.0
+            if user == EMPTY_KEY:
+                break
+            if free < 0 and expires[i] <= now:
+                free = i
+            i = (i + 1) & mask
+
+        if free >= 0:
+            # Переиспользуем слот истекшей записи: пары дальше в цепочке нет
+            i = free
+        else:
+            self._used += 1
+        chats[i] = chat_id
+        users[i] = user_id
+        expires[i] = expire
+
+        if self._used > (mask + 1) * MAX_LOAD:
+            self._rebuild(now)
+        return 0.0
+
+    def remaining(self, chat_id: int, user_id: int) -> float:
+        """
+        Оставшееся время cooldown без его изменения
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+
+        Returns:
+            Оставшееся время в секундах (0 если cooldown нет)
+        """
+        # Сначала время: _now() может сдвинуть эпоху и все смещения
+        now = self._now()
+        i = self._find(chat_id, user_id)
+        if i < 0:
+            return 0.0
+        return max(self._expires[i] - now, 0) / 1000
+
+    def clear_user(self, chat_id: int, user_id: int) -> None:
+        """
+        Очистка cooldown для конкретного пользователя
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+        """
+        i = self._find(chat_id, user_id)
+        if i >= 0:
+            # Запись становится истекшей: цепочка пробирования не рвется
+            self._expires[i] = 0
+
+    def clear_chat(self, chat_id: int) -> None:
+        """
+        Очистка всех cooldown в чате (полный проход по таблице)
+
+        Args:
+            chat_id: ID чата
+        """
+        chats = self._chats
+        expires = self._expires
+        for i in range(len(chats)):
+            if chats[i] == chat_id:
+                expires[i] = 0
+
+    def nbytes(self) -> int:
+        """Размер буферов таблицы в байтах"""
+        return sum(
+            buffer.buffer_info()[1] * buffer.itemsize
+            for buffer in (self._chats, self._users, self._expires)
+        )
+
+    def __len__(self) -> int:
+        """Количество занятых слотов (включая еще не вытесненные истекшие)"""
+        return self._used
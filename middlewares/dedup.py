@@ -0,0 +1,115 @@
+"""
+Middleware для отбрасывания повторных доставок апдейтов (по update_id)
+
+Если webhook отвечает медленно, Telegram присылает тот же апдейт повторно.
+Недавно виденные update_id хранятся в битовом окне фиксированного размера,
+проверка и отметка выполняются за O(1) (амортизированно).
+"""
+import logging
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateIdWindow:
+    """
+    Битовое окно последних update_id.
+
+    Хранит по одному биту на каждый update_id из диапазона
+    (max_id - size, max_id]. update_id в Telegram возрастают, поэтому
+    повторная доставка почти всегда попадает в окно. Если id оказался
+    старше окна, считаем, что последовательность начата заново
+    (Telegram может сбросить update_id после долгого простоя).
+    """
+
+    def __init__(self, size: int = 65536):
+        """
+        Args:
+            size: Размер окна в update_id (кратен 8, память - size / 8 байт)
+        """
+        self.size = (size + 7) // 8 * 8
+        self.bits = bytearray(self.size // 8)
+        self.max_id: int = -1
+
+    def _clear_range(self, start: int, stop: int) -> None:
+        """Сбросить биты для update_id из [start, stop)"""
+        if stop - start >= self.size:
+            self.bits[:] = bytes(len(self.bits))
+            return
+        bits = self.bits
+        for update_id in range(start, stop):
+            pos = update_id % self.size
+            bits[pos >> 3] &= ~(1 << (pos & 7)) & 0xFF
+
+    def seen(self, update_id: int) -> bool:
+        """
+        Проверить update_id и отметить его как увиденный
+
+        Args:
+            update_id: ID апдейта
+
+        Returns:
+            True если апдейт уже был получен (повторная доставка)
+        """
+        if update_id > self.max_id:
+            if self.max_id >= 0:
+                self._clear_range(self.max_id + 1, update_id + 1)
+            self.max_id = update_id
+        elif update_id <= self.max_id - self.size:
+            # Слишком старый id - последовательность начата заново
+            self.bits[:] = bytes(len(self.bits))
+            self.max_id = update_id
+
+        pos = update_id % self.size
+        mask = 1 << (pos & 7)
+        if self.bits[pos >> 3] & mask:
+            return True
+        self.bits[pos >> 3] |= mask
+        return False
+
+
+class UpdateDedupMiddleware(BaseMiddleware):
+    """
+    Outer middleware для dp.update: отвечает на повторные доставки сразу,
+    не передавая их в обработчики (и в CooldownMiddleware).
+    """
+
+    def __init__(self, window_size: int = 65536):
+        """
+        Args:
+            window_size: Сколько последних update_id помнить
+        """
+        super().__init__()
+        self.window = UpdateIdWindow(window_size)
+        # Количество отброшенных повторных доставок
+        self.duplicates = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Обработка входящего апдейта
+
+        Args:
+            handler: Следующий обработчик в цепочке
+            event: Объект апдейта
+            data: Дополнительные данные
+
+        Returns:
+            Результат обработки или None для повторной доставки
+        """
+        if self.window.seen(event.update_id):
+            self.duplicates += 1
+            logger.debug(
+                f"Повторная доставка апдейта {event.update_id} пропущена "
+                f"(всего повторов: {self.duplicates})"
+            )
+            return None
+
+        return await handler(event, data)
@@ -0,0 +1,213 @@
+"""
+Тесты общего табло cooldown
+"""
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.methods import EditMessageText
+
+import middlewares.cooldown_board as cooldown_board
+from middlewares.cooldown_board import CooldownBoard, _Board, update_interval
+
+CHAT_ID = -100
+
+
+class FakeChat:
+    def __init__(self, chat_id: int):
+        self.id = chat_id
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+
+class FakeBot:
+    """Журнал обращений к Telegram и очередь ошибок для edit_text"""
+
+    def __init__(self):
+        self.calls = []
+        self.edit_errors = []
+        self.delete_errors = []
+        self.sent = 0
+
+
+class FakeMessage:
+    """Сообщение с записью answer/edit_text/delete/pin в журнал"""
+
+    def __init__(self, bot: FakeBot, user_id: int = 0, number: int = 0):
+        self.bot = bot
+        self.chat = FakeChat(CHAT_ID)
+        self.from_user = FakeUser(user_id)
+        self.number = number
+
+    async def answer(self, text: str):
+        self.bot.sent += 1
+        self.bot.calls.append(("send", self.bot.sent, text))
+        return FakeMessage(self.bot, number=self.bot.sent)
+
+    async def edit_text(self, text: str):
+        if self.bot.edit_errors:
+            raise self.bot.edit_errors.pop(0)
+        self.bot.calls.append(("edit", self.number, text))
+
+    async def delete(self):
+        if self.bot.delete_errors:
+            raise self.bot.delete_errors.pop(0)
+        self.bot.calls.append(("delete", self.number))
+
+    async def pin(self, **kwargs):
+        self.bot.calls.append(("pin", self.number))
+
+
+def kinds(bot: FakeBot):
+    return [call[0] for call in bot.calls]
+
+
+def bad_request(message: str) -> TelegramBadRequest:
+    return TelegramBadRequest(method=EditMessageText(text=""), message=message)
+
+
+@pytest.fixture
+def fast_board(monkeypatch):
+    """Табло с интервалами в десятки миллисекунд вместо секунд"""
+    monkeypatch.setattr(cooldown_board, "MIN_UPDATE_INTERVAL", 0.05)
+    monkeypatch.setattr(cooldown_board, "UPDATE_INTERVALS", ((1, 0.5),))
+
+
+def test_update_interval_is_adaptive():
+    """Долгое ожидание - редкие обновления, под конец - частые"""
+    assert update_interval(300) == 30.0
+    assert update_interval(45) == 10.0
+    assert update_interval(5) == cooldown_board.MIN_UPDATE_INTERVAL
+    assert cooldown_board.MIN_UPDATE_INTERVAL >= 4.0
+
+
+def test_board_sends_once_edits_and_deletes(fast_board):
+    """Одна отправка, правки по мере истечения, удаление пустого табло"""
+    bot = FakeBot()
+    board = CooldownBoard(pin=True)
+
+    async def scenario():
+        board.add(FakeMessage(bot, user_id=1), "Ann", 0.3)
+        board.add(FakeMessage(bot, user_id=2), "Bob", 0.6)
+        await asyncio.sleep(1.0)
+
+    asyncio.run(scenario())
+
+    assert kinds(bot)[:2] == ["send", "pin"]
+    assert kinds(bot).count("send") == 1
+    assert "edit" in kinds(bot)
+    # После истечения Ann на табло остался только Bob
+    last_edit = [call for call in bot.calls if call[0] == "edit"][-1]
+    assert "Bob" in last_edit[2] and "Ann" not in last_edit[2]
+    assert bot.calls[-1] == ("delete", 1)
+    assert board.boards == {}
+
+
+def test_clear_wakes_loop(fast_board):
+    """clear() будит цикл и табло удаляется без ожидания интервала"""
+    bot = FakeBot()
+    board = CooldownBoard()
+
+    async def scenario():
+        board.add(FakeMessage(bot, user_id=1), "Ann", 100)
+        await asyncio.sleep(0.1)
+        board.clear(CHAT_ID)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    assert kinds(bot) == ["send", "delete"]
+    assert board.boards == {}
+
+
+def test_discard_wakes_loop(fast_board):
+    """discard() убирает пользователя с табло до следующего интервала"""
+    bot = FakeBot()
+    board = CooldownBoard()
+
+    async def scenario():
+        board.add(FakeMessage(bot, user_id=1), "Ann", 100)
+        board.add(FakeMessage(bot, user_id=2), "Bob", 100)
+        await asyncio.sleep(0.1)
+        board.discard(CHAT_ID, 1)
+        await asyncio.sleep(0.2)
+        board.clear(CHAT_ID)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    edits = [call for call in bot.calls if call[0] == "edit"]
+    assert edits and "Ann" not in edits[0][2] and "Bob" in edits[0][2]
+
+
+def publish_with_errors(edit_errors, delete_errors=()):
+    """Отправить табло, затем обновить его при заданных ошибках"""
+    bot = FakeBot()
+    bot.delete_errors = list(delete_errors)
+    board = CooldownBoard()
+    state = _Board(chat_message=FakeMessage(bot))
+
+    async def scenario():
+        await board._publish(state, "first")
+        bot.edit_errors = list(edit_errors)
+        await board._publish(state, "second")
+
+    asyncio.run(scenario())
+    return bot, state
+
+
+def test_retry_after_keeps_board():
+    """Flood control: табло не заменяется, правка повторится позже"""
+    bot, state = publish_with_errors([
+        TelegramRetryAfter(
+            method=EditMessageText(text=""), message="Flood", retry_after=0
+        )
+    ])
+
+    assert kinds(bot) == ["send"]
+    assert state.message.number == 1
+    assert state.text == "first"
+
+
+def test_not_modified_counts_as_applied():
+    bot, state = publish_with_errors([
+        bad_request("Bad Request: message is not modified")
+    ])
+
+    assert kinds(bot) == ["send"]
+    assert state.message.number == 1
+    assert state.text == "second"
+
+
+def test_edit_not_found_sends_new_board():
+    """Табло удалили вручную - следующее обновление отправит новое"""
+    bot, state = publish_with_errors([
+        bad_request("Bad Request: message to edit not found")
+    ])
+
+    assert state.message is None
+    assert state.text == ""
+    assert kinds(bot) == ["send"]
+
+
+def test_other_error_deletes_old_board():
+    """Другая ошибка - старое табло удаляется перед отправкой нового"""
+    bot, state = publish_with_errors([bad_request("Bad Request: other")])
+
+    assert kinds(bot) == ["send", "delete"]
+    assert state.message is None
+
+
+def test_other_error_keeps_board_if_delete_fails():
+    """Если старое табло не удалось удалить, новое не отправляется"""
+    bot, state = publish_with_errors(
+        [bad_request("Bad Request: other")],
+        delete_errors=[bad_request("Bad Request: message can't be deleted")]
+    )
+
+    assert kinds(bot) == ["send"]
+    assert state.message.number == 1
+    assert state.text == "first"
@@ -0,0 +1,114 @@
+"""
+Тесты компактной таблицы cooldown
+"""
+import random
+
+import pytest
+
+from middlewares.cooldown_table import CooldownTable, REBASE_THRESHOLD
+
+COOLDOWN = 10
+
+
+class FakeClock:
+    """Управляемые часы для таблицы"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_check_and_set_blocks_until_expiry():
+    """Повторное сообщение блокируется до окончания cooldown"""
+    clock = FakeClock()
+    table = CooldownTable(COOLDOWN, clock=clock)
+
+    assert table.check_and_set(-100, 1) == 0
+    clock.now = 4.0
+    assert table.check_and_set(-100, 1) == pytest.approx(6.0)
+    assert table.remaining(-100, 1) == pytest.approx(6.0)
+    # Другой чат и другой пользователь не затронуты
+    assert table.check_and_set(-200, 1) == 0
+    assert table.check_and_set(-100, 2) == 0
+
+    clock.now = 10.0
+    assert table.remaining(-100, 1) == 0
+    assert table.check_and_set(-100, 1) == 0
+
+
+def test_remaining_after_rebase():
+    """remaining() сравнивает время окончания и "сейчас" в одной эпохе"""
+    clock = FakeClock()
+    table = CooldownTable(COOLDOWN, clock=clock)
+
+    clock.now = REBASE_THRESHOLD / 1000 - 5
+    assert table.check_and_set(-100, 1) == 0
+    clock.now += 6
+    assert table.remaining(-100, 1) == pytest.approx(4.0)
+    assert table.check_and_set(-100, 1) == pytest.approx(4.0)
+
+
+def test_clear_user_and_chat():
+    """Очистка снимает cooldown только с выбранных записей"""
+    clock = FakeClock()
+    table = CooldownTable(COOLDOWN, clock=clock)
+    for user_id in range(1, 50):
+        table.check_and_set(-100, user_id)
+        table.check_and_set(-200, user_id)
+
+    table.clear_user(-100, 7)
+    assert table.check_and_set(-100, 7) == 0
+    assert table.check_and_set(-100, 8) > 0
+
+    table.clear_chat(-200)
+    for user_id in range(1, 50):
+        assert table.remaining(-200, user_id) == 0
+        assert table.remaining(-100, user_id) > 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_match_dict(seed):
+    """Случайная последовательность операций совпадает с эталонным dict"""
+    rnd = random.Random(seed)
+    clock = FakeClock()
+    table = CooldownTable(COOLDOWN, clock=clock)
+    # {(chat_id, user_id): время окончания cooldown}
+    reference = {}
+
+    for step in range(30000):
+        # Шаг кратен 1 мс, чтобы не зависеть от округления
+        clock.now += rnd.randrange(20) / 1000
+        if step == 15000:
+            # Перескакиваем порог сдвига эпохи с живыми записями
+            clock.now += REBASE_THRESHOLD / 1000 - 5
+
+        chat_id = -1000000000000 - rnd.randrange(8)
+        user_id = rnd.randrange(1, 500) * 7919
+        op = rnd.random()
+
+        if op < 0.05:
+            table.clear_user(chat_id, user_id)
+            reference.pop((chat_id, user_id), None)
+        elif op < 0.052:
+            table.clear_chat(chat_id)
+            for key in [k for k in reference if k[0] == chat_id]:
+                del reference[key]
+        elif op < 0.3:
+            expected = max(reference.get((chat_id, user_id), 0) - clock.now, 0)
+            assert table.remaining(chat_id, user_id) == pytest.approx(
+                expected, abs=0.002
+            )
+        else:
+            expires = reference.get((chat_id, user_id), 0)
+            remaining = table.check_and_set(chat_id, user_id)
+            if expires - clock.now > 0.001:
+                assert remaining == pytest.approx(expires - clock.now, abs=0.002)
+            elif expires <= clock.now:
+                assert remaining == 0
+                reference[(chat_id, user_id)] = clock.now + COOLDOWN
+            else:
+                # Граница в пределах 1 мс - синхронизируем эталон
+                if remaining == 0:
+                    reference[(chat_id, user_id)] = clock.now + COOLDOWN
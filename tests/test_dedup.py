@@ -0,0 +1,85 @@
+"""
+Тесты отбрасывания повторных доставок апдейтов
+"""
+import asyncio
+import random
+
+from aiogram.types import Update
+
+from middlewares.dedup import UpdateDedupMiddleware, UpdateIdWindow
+
+
+def test_replay_duplicated_reordered_stream():
+    """Повторы и перестановки внутри окна совпадают с эталонным set"""
+    rnd = random.Random(42)
+    window = UpdateIdWindow(1024)
+    base = 10 ** 9
+
+    stream = []
+    for i in range(20000):
+        stream.append(base + i)
+        if rnd.random() < 0.3:
+            stream.append(base + i - rnd.randrange(min(1000, i + 1)))
+    for i in range(0, len(stream) - 1, 2):
+        if rnd.random() < 0.2:
+            stream[i], stream[i + 1] = stream[i + 1], stream[i]
+
+    seen = set()
+    for update_id in stream:
+        assert window.seen(update_id) == (update_id in seen)
+        seen.add(update_id)
+
+
+def test_window_wraps_around():
+    """Сдвиг окна за его конец сбрасывает биты старых id"""
+    window = UpdateIdWindow(64)
+    for update_id in range(100, 164):
+        assert not window.seen(update_id)
+
+    # 164 и 200 попадают в те же позиции, что и 100 и 136
+    assert not window.seen(164)
+    assert not window.seen(200)
+    assert window.seen(200)
+    assert window.seen(163)
+
+    # Прыжок больше окна очищает его целиком
+    assert not window.seen(1000)
+    assert not window.seen(1000 - 64 + 1)
+    assert window.seen(1000)
+
+
+def test_id_older_than_window_resets():
+    """id старше окна считается началом новой последовательности"""
+    window = UpdateIdWindow(64)
+    for update_id in range(1000, 1100):
+        window.seen(update_id)
+
+    assert not window.seen(5)
+    assert window.max_id == 5
+    assert window.seen(5)
+    assert not window.seen(6)
+    assert not window.seen(1099)
+
+
+def test_middleware_counts_and_skips_duplicates():
+    """Повторная доставка не доходит до обработчика и учитывается"""
+    middleware = UpdateDedupMiddleware(window_size=128)
+    handled = []
+
+    async def handler(event, data):
+        handled.append(event.update_id)
+        return "handled"
+
+    async def feed(update_ids):
+        return [
+            await middleware(handler, Update(update_id=update_id), {})
+            for update_id in update_ids
+        ]
+
+    results = asyncio.run(feed([1, 2, 2, 3, 1, 3, 3, 4]))
+
+    assert handled == [1, 2, 3, 4]
+    assert results == [
+        "handled", "handled", None, "handled", None, None, None, "handled"
+    ]
+    assert middleware.duplicates == 4
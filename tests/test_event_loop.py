@@ -0,0 +1,56 @@
+"""
+Тесты гистограммы задержек event loop
+"""
+import asyncio
+
+from utils.event_loop import LAG_BUCKETS_MS, LagHistogram, LoopWatchdog
+
+
+def test_bucket_edges():
+    """Значение на границе попадает в свою корзину, выше - в следующую"""
+    histogram = LagHistogram()
+    histogram.add(0)
+    histogram.add(1)
+    histogram.add(1.001)
+    histogram.add(5000)
+    histogram.add(5000.1)
+    histogram.add(60000)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["<=1ms"] == 2
+    assert snapshot["<=5ms"] == 1
+    assert snapshot["<=5000ms"] == 1
+    assert snapshot[">5000ms"] == 2
+    assert sum(snapshot.values()) == histogram.total == 6
+    assert len(snapshot) == len(LAG_BUCKETS_MS) + 1
+    assert histogram.max_ms == 60000
+
+
+def test_percentile():
+    """Перцентиль - верхняя граница корзины, для переполнения - максимум"""
+    histogram = LagHistogram()
+    assert histogram.percentile(0.5) == 0.0
+
+    for _ in range(98):
+        histogram.add(0.5)
+    histogram.add(30)
+    histogram.add(7000)
+
+    assert histogram.percentile(0.5) == 1
+    assert histogram.percentile(0.99) == 50
+    assert histogram.percentile(1.0) == 7000
+
+
+def test_interval_histogram_is_reset_after_report():
+    """Периодический отчет покрывает только свой интервал"""
+    watchdog = LoopWatchdog(threshold=1.0, interval=0.01, report_interval=0.1)
+
+    async def scenario():
+        watchdog.start()
+        await asyncio.sleep(0.25)
+        await watchdog.stop()
+
+    asyncio.run(scenario())
+
+    assert watchdog.histogram.total > watchdog.interval_histogram.total
+    assert watchdog.interval_histogram.total < 0.1 / 0.01 + 2
@@ -0,0 +1,6 @@
+"""
+Пакет утилит
+"""
+from .event_loop import install_fast_event_loop, LoopWatchdog
+
+__all__ = ['install_fast_event_loop', 'LoopWatchdog']
@@ -0,0 +1,201 @@
+"""
+Настройка event loop и watchdog задержек планировщика
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы задержек в миллисекундах
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def install_fast_event_loop() -> bool:
+    """
+    Включить uvloop вместо стандартного event loop, если он установлен
+
+    Вызывать до asyncio.run / web.run_app.
+
+    Returns:
+        True если uvloop включен
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop не установлен, используется стандартный event loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info(f"Включен uvloop {uvloop.__version__}")
+    return True
+
+
+class LagHistogram:
+    """Гистограмма задержек event loop по корзинам LAG_BUCKETS_MS"""
+
+    def __init__(self):
+        # Последняя корзина - задержки больше последней границы
+        self.counts: List[int] = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, lag_ms: float) -> None:
+        """Учесть одно измерение задержки"""
+        for i, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        Верхняя граница корзины, в которую попадает перцентиль q
+
+        Args:
+            q: Перцентиль от 0 до 1
+
+        Returns:
+            Задержка в миллисекундах
+        """
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count and i < len(LAG_BUCKETS_MS):
+                return float(LAG_BUCKETS_MS[i])
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, int]:
+        """Количество измерений по корзинам: {"<=10ms": 5, ..., ">5000ms": 0}"""
+        result = {
+            f"<={bound}ms": count
+            for bound, count in zip(LAG_BUCKETS_MS, self.counts)
+        }
+        result[f">{LAG_BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return result
+
+    def summary(self) -> str:
+        """Строка для логов: перцентили и непустые корзины гистограммы"""
+        buckets = ", ".join(
+            f"{bucket}: {count}"
+            for bucket, count in self.snapshot().items() if count
+        )
+        return (
+            f"p50<={self.percentile(0.5):.0f}ms, "
+            f"p99<={self.percentile(0.99):.0f}ms, "
+            f"max={self.max_ms:.0f}ms, измерений: {self.total}; "
+            f"гистограмма: {{{buckets}}}"
+        )
+
+
+class LoopWatchdog:
+    """
+    Watchdog задержек event loop.
+
+    Корутина в цикле засыпает на `interval` и измеряет, насколько позже
+    она проснулась, - это задержка планировщика, она попадает в гистограмму.
+    Отдельный поток следит за "пульсом" корутины: если цикл не отвечает
+    дольше `threshold`, в лог выводится стек потока event loop, то есть
+    код, который его блокирует.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        report_interval: float = 60.0
+    ):
+        """
+        Args:
+            threshold: Задержка в секундах, после которой выводится стек
+            interval: Период измерений в секундах
+            report_interval: Период вывода гистограммы в лог в секундах
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.report_interval = report_interval
+        # Гистограмма за все время работы (выводится при остановке)
+        self.histogram = LagHistogram()
+        # Гистограмма текущего периода (выводится и сбрасывается каждый отчет)
+        self.interval_histogram = LagHistogram()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Запустить watchdog (вызывать внутри работающего event loop)"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Watchdog event loop запущен (порог: {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        """Остановить watchdog и вывести итоговую гистограмму"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info(
+            f"Задержки event loop за все время: {self.histogram.summary()}"
+        )
+
+    async def _measure(self) -> None:
+        """Измерение задержки планировщика"""
+        next_report = time.monotonic() + self.report_interval
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag_ms = max(now - start - self.interval, 0) * 1000
+            self.histogram.add(lag_ms)
+            self.interval_histogram.add(lag_ms)
+
+            if now >= next_report:
+                next_report = now + self.report_interval
+                logger.info(
+                    f"Задержки event loop за {self.report_interval:.0f}s: "
+                    f"{self.interval_histogram.summary()}"
+                )
+                self.interval_histogram = LagHistogram()
+
+    def _watch(self) -> None:
+        """Поток, выводящий стек заблокированного event loop"""
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            # Один стек на каждую остановку цикла
+            if stalled < self.threshold or reported == heartbeat:
+                continue
+            reported = heartbeat
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop заблокирован дольше {stalled * 1000:.0f}ms:\n{stack}"
+            )